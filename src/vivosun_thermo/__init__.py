@@ -10,4 +10,5 @@ from vivosun_thermo.client import (
     TempUnit,
     VivosunThermoClient,
 )
+from vivosun_thermo.registry import DeviceRegistry
 from vivosun_thermo.scanner import VivosunThermoScanner
@@ -6,7 +6,7 @@ from vivosun_thermo.app import VivosunThermoApp
 
 def main():
     app = VivosunThermoApp()
-    asyncio.run(app.run(sys.argv))
+    sys.exit(asyncio.run(app.run(sys.argv)))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
+import asyncio
 import json
-from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from argparse import SUPPRESS, ArgumentDefaultsHelpFormatter, ArgumentParser, ArgumentTypeError
+from datetime import datetime
 from typing import Literal, NamedTuple
 
 from vivosun_thermo.client import (
@@ -12,15 +14,22 @@ from vivosun_thermo.client import (
     VivosunThermoClient,
 )
 from vivosun_thermo.format import format_humidity, format_temperature, format_vpd
+from vivosun_thermo.registry import DeviceRegistry
 from vivosun_thermo.scanner import VivosunThermoScanner
 
+EXPORT_PARQUET = "parquet"
+EXPORT_ARROW = "arrow"
+
 FORMAT_TEXT = "text"
 FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
 
 
 class GlobalCommandArgs(NamedTuple):
     adapter: str | None
-    format: Literal["text", "json"]
+    format: Literal["text", "json", "ndjson"]
+    registry: str | None
+    no_registry: bool
 
 
 class ListCommandArgs(GlobalCommandArgs):
@@ -30,10 +39,45 @@ class ListCommandArgs(GlobalCommandArgs):
 class StatusCommandArgs(GlobalCommandArgs):
     connect_timeout: float
     read_timeout: float
-    address: str
+    device_timeout: float
+    concurrency: int
+    inventory: str | None
+    inventory_addresses: list[str]
+    addresses: list[str]
     unit: TempUnit
 
 
+class ExportCommandArgs(GlobalCommandArgs):
+    connect_timeout: float
+    read_timeout: float
+    addresses: list[str]
+    output: str
+    output_format: Literal["parquet", "arrow"]
+    compression: str
+    row_group_size: int
+    history: bool
+
+
+def positive_int(value: str) -> int:
+    result = int(value)
+    if result < 1:
+        raise ArgumentTypeError(f"{value} is not a positive integer")
+    return result
+
+
+def positive_float(value: str) -> float:
+    result = float(value)
+    if result <= 0:
+        raise ArgumentTypeError(f"{value} is not a positive number")
+    return result
+
+
+def default_device_timeout(connect_timeout: float, read_timeout: float) -> float:
+    # with registry a stale device needs failed direct connect, scan and connect again,
+    # each up to connect timeout, then a few reads
+    return 3 * connect_timeout + 10 * read_timeout
+
+
 class VivosunThermoApp:
     async def run(self, argv: list[str]):
         parser = ArgumentParser(
@@ -49,10 +93,19 @@ class VivosunThermoApp:
         parser.add_argument(
             "-f",
             "--format",
-            choices=(FORMAT_TEXT, FORMAT_JSON),
+            choices=(FORMAT_TEXT, FORMAT_JSON, FORMAT_NDJSON),
             help="output format",
             default=FORMAT_TEXT,
         )
+        parser.add_argument(
+            "--registry",
+            help="known devices registry file (default: ~/.cache/vivosun-thermo/devices.json)",
+        )
+        parser.add_argument(
+            "--no-registry",
+            action="store_true",
+            help="don't use known devices registry, always scan before connect",
+        )
 
         subparsers = parser.add_subparsers(required=True, help="sub-command help")
 
@@ -69,6 +122,13 @@ class VivosunThermoApp:
         )
         parser_list.set_defaults(func=self.cmd_list)
 
+        parser_registry = subparsers.add_parser(
+            "registry",
+            help="show known devices and connect statistics",
+            formatter_class=ArgumentDefaultsHelpFormatter,
+        )
+        parser_registry.set_defaults(func=self.cmd_registry)
+
         parser_status = subparsers.add_parser(
             "status",
             help="read status (temperature, humidity, vpd)",
@@ -94,14 +154,98 @@ class VivosunThermoApp:
             default=0.5,
         )
         parser_status.add_argument(
-            "address",
-            help="device address",
+            "--device-timeout",
+            type=positive_float,
+            help="total timeout for connecting and reading one device"
+            " (default: 3 x connect timeout + 10 x read timeout)",
+            default=SUPPRESS,
+        )
+        parser_status.add_argument(
+            "--concurrency",
+            type=positive_int,
+            help="max devices read at the same time",
+            default=4,
+        )
+        parser_status.add_argument(
+            "--inventory",
+            help="file with device addresses, one per line",
+        )
+        parser_status.add_argument(
+            "addresses",
+            nargs="*",
+            help="device addresses",
         )
         parser_status.set_defaults(func=self.cmd_status)
 
+        parser_export = subparsers.add_parser(
+            "export",
+            help="export status and history to parquet or arrow file",
+            formatter_class=ArgumentDefaultsHelpFormatter,
+        )
+        parser_export.add_argument(
+            "-o",
+            "--output",
+            help="output file",
+            required=True,
+        )
+        parser_export.add_argument(
+            "--output-format",
+            choices=(EXPORT_PARQUET, EXPORT_ARROW),
+            help="output file format",
+            default=EXPORT_PARQUET,
+        )
+        parser_export.add_argument(
+            "--compression",
+            choices=("zstd", "lz4", "none"),
+            help="output file compression",
+            default="zstd",
+        )
+        parser_export.add_argument(
+            "--row-group-size",
+            type=positive_int,
+            help="max rows buffered in memory and written as one row group",
+            default=65536,
+        )
+        parser_export.add_argument(
+            "--no-history",
+            dest="history",
+            action="store_false",
+            help="export current status only",
+        )
+        parser_export.add_argument(
+            "--connect-timeout",
+            type=float,
+            help="connect timeout",
+            default=15,
+        )
+        parser_export.add_argument(
+            "--read-timeout",
+            type=float,
+            help="read timeout",
+            default=0.5,
+        )
+        parser_export.add_argument(
+            "addresses",
+            nargs="+",
+            help="device addresses",
+        )
+        parser_export.set_defaults(func=self.cmd_export)
+
         args = parser.parse_args(argv[1:])
 
-        await args.func(args)
+        if args.func == self.cmd_status:
+            try:
+                args.inventory_addresses = self._read_inventory(args.inventory)
+            except OSError as e:
+                parser_status.error(f"can't read inventory file: {e}")
+            if not args.addresses and not args.inventory_addresses:
+                parser_status.error("at least one device address or --inventory is required")
+            if getattr(args, "device_timeout", None) is None:
+                args.device_timeout = default_device_timeout(
+                    args.connect_timeout, args.read_timeout
+                )
+
+        return await args.func(args)
 
     async def cmd_list(self, args: ListCommandArgs):
         if args.format == FORMAT_JSON:
@@ -110,6 +254,9 @@ class VivosunThermoApp:
                 async for dev in self._list_devices(args)
             ]
             self._print_json(result)
+        elif args.format == FORMAT_NDJSON:
+            async for dev in self._list_devices(args):
+                self._print_ndjson({"address": dev.address, "name": dev.name})
         else:
             async for dev in self._list_devices(args):
                 print(f"{dev.address} {dev.name}")
@@ -118,29 +265,167 @@ class VivosunThermoApp:
         for dev in await VivosunThermoScanner.discover(
             timeout=args.scan_timeout,
             adapter=args.adapter,
+            registry=self._create_registry(args),
         ):
             yield dev
 
+    async def cmd_registry(self, args: GlobalCommandArgs):
+        registry = DeviceRegistry(args.registry)
+        stats = registry.stats
+        if args.format != FORMAT_TEXT:
+            result = {
+                "devices": [entry._asdict() for entry in registry.devices.values()],
+                "stats": {
+                    **stats._asdict(),
+                    "avg_hit_time": stats.avg_hit_time,
+                    "avg_miss_time": stats.avg_miss_time,
+                    "saved_time": stats.saved_time,
+                },
+            }
+            if args.format == FORMAT_JSON:
+                self._print_json(result)
+            else:
+                self._print_ndjson(result)
+        else:
+            for entry in registry.devices.values():
+                last_seen = datetime.fromtimestamp(entry.last_seen).isoformat(timespec="seconds")
+                print(
+                    f"{entry.address} {entry.name} adapter={entry.adapter} rssi={entry.rssi}"
+                    f" last_seen={last_seen} direct={entry.details is not None}"
+                )
+            print(f"Hits: {stats.hits} (avg connect {stats.avg_hit_time:.2f}s)")
+            print(f"Misses: {stats.misses} (avg scan and connect {stats.avg_miss_time:.2f}s)")
+            print(f"Saved: {stats.saved_time:.2f}s")
+
+    def _create_registry(self, args: GlobalCommandArgs) -> DeviceRegistry | None:
+        return None if args.no_registry else DeviceRegistry(args.registry)
+
     async def cmd_status(self, args: StatusCommandArgs):
+        addresses = list(dict.fromkeys(args.addresses + args.inventory_addresses))
+        registry = self._create_registry(args)
+
+        # single device output is kept as is for backward compatibility
+        if len(args.addresses) == 1 and not args.inventory and args.format != FORMAT_NDJSON:
+            status = await asyncio.wait_for(
+                self._read_status(addresses[0], args, registry), args.device_timeout
+            )
+            if args.format == FORMAT_JSON:
+                self._print_json(status)
+            else:
+                self._print_status_text(status, args.unit)
+            return 0
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        tasks = [
+            asyncio.create_task(self._read_status_safe(address, args, registry, semaphore))
+            for address in addresses
+        ]
+        result: dict[str, dict] = {}
+        for task in asyncio.as_completed(tasks):
+            address, status = await task
+            result[address] = status
+            if args.format == FORMAT_NDJSON:
+                self._print_ndjson({"address": address, **status})
+            elif args.format == FORMAT_TEXT:
+                if len(result) > 1:
+                    print("")
+                print(f"Device {address}:")
+                if "error" in status:
+                    print(f"  Error: {status["error"]}")
+                else:
+                    self._print_status_text(status, args.unit, indent="  ")
+
+        if args.format == FORMAT_JSON:
+            self._print_json({address: result[address] for address in addresses})
+
+        return 1 if any("error" in status for status in result.values()) else 0
+
+    def _read_inventory(self, path: str | None) -> list[str]:
+        addresses: list[str] = []
+        if path:
+            with open(path, "r") as file:
+                for line in file:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        addresses.append(line.split()[0])
+        return addresses
+
+    async def _read_status_safe(
+        self,
+        address: str,
+        args: StatusCommandArgs,
+        registry: DeviceRegistry | None,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[str, dict]:
+        async with semaphore:
+            try:
+                status = await asyncio.wait_for(
+                    self._read_status(address, args, registry), args.device_timeout
+                )
+            except Exception as e:
+                status = {"error": self._format_error(e)}
+        return address, status
+
+    def _format_error(self, e: Exception) -> str:
+        return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+    async def _read_status(
+        self, address: str, args: StatusCommandArgs, registry: DeviceRegistry | None
+    ) -> dict:
         async with VivosunThermoClient(
-            args.address,
+            address,
             adapter=args.adapter,
+            registry=registry,
             connect_timeout=args.connect_timeout,
             read_timeout=args.read_timeout,
         ) as client:
-            if args.format == FORMAT_JSON:
-                await self._print_status_json(client, args.unit)
-            else:
-                await self._print_status_text(client, args.unit)
+            return await self._get_status_obj(client, args.unit)
+
+    async def cmd_export(self, args: ExportCommandArgs):
+        # numpy and pyarrow are optional dependencies, only needed for export
+        from vivosun_thermo.export import VivosunThermoExporter
 
-    async def _print_status_json(self, client: VivosunThermoClient, unit: TempUnit):
+        with VivosunThermoExporter(
+            args.output,
+            format=args.output_format,
+            compression=None if args.compression == "none" else args.compression,
+            row_group_size=args.row_group_size,
+        ) as exporter:
+            registry = self._create_registry(args)
+            errors: dict[str, str] = {}
+            for address in args.addresses:
+                # skip failed device, it is reported and missing or incomplete in output
+                try:
+                    async with VivosunThermoClient(
+                        address,
+                        adapter=args.adapter,
+                        registry=registry,
+                        connect_timeout=args.connect_timeout,
+                        read_timeout=args.read_timeout,
+                    ) as client:
+                        await exporter.export_device(client, address, history=args.history)
+                except Exception as e:
+                    errors[address] = self._format_error(e)
+
+        result = {"output": args.output, "rows": exporter.rows, "errors": errors}
+        if args.format == FORMAT_JSON:
+            self._print_json(result)
+        elif args.format == FORMAT_NDJSON:
+            self._print_ndjson(result)
+        else:
+            print(f"Exported {exporter.rows} rows to {args.output}")
+            for address, error in errors.items():
+                print(f"Failed to export {address}: {error}")
+
+        return 1 if errors else 0
+
+    async def _get_status_obj(self, client: VivosunThermoClient, unit: TempUnit) -> dict:
         main_sensor = await self._get_probe_obj(client, PROBE_MAIN, unit)
         external_sensor = await self._get_probe_obj(client, PROBE_EXTERNAL, unit)
-        result = {
+        return {
             "main_sensor": main_sensor,
             **({"external_sensor": external_sensor} if external_sensor is not None else {}),
         }
-        self._print_json(result)
 
     async def _get_probe_obj(self, client: VivosunThermoClient, probe: ProbeType, unit: TempUnit):
         if probe == PROBE_EXTERNAL and not await client.has_external_probe():
@@ -151,23 +436,20 @@ class VivosunThermoApp:
             "vpd": await client.current_vpd(probe),
         }
 
-    async def _print_status_text(self, client: VivosunThermoClient, unit: TempUnit):
-        await self._print_probe_text(client, PROBE_MAIN, unit)
-        if await client.has_external_probe():
+    def _print_status_text(self, status: dict, unit: TempUnit, indent: str = ""):
+        self._print_probe_text(status["main_sensor"], PROBE_MAIN, unit, indent)
+        if "external_sensor" in status:
             print("")
-            await self._print_probe_text(client, PROBE_EXTERNAL, unit)
+            self._print_probe_text(status["external_sensor"], PROBE_EXTERNAL, unit, indent)
 
-    async def _print_probe_text(
-        self, client: VivosunThermoClient, probe: ProbeType, unit: TempUnit
-    ):
-        temp = await client.current_temperature(probe, unit)
-        humidity = await client.current_humidity(probe)
-        vpd = await client.current_vpd(probe)
-
-        print(f"{"Main" if probe == PROBE_MAIN else "External"} Sensor:")
-        print(f"  Temperature: {format_temperature(temp, unit)}")
-        print(f"  Humidity: {format_humidity(humidity)}")
-        print(f"  VPD: {format_vpd(vpd)}")
+    def _print_probe_text(self, probe_obj: dict, probe: ProbeType, unit: TempUnit, indent: str):
+        print(f"{indent}{"Main" if probe == PROBE_MAIN else "External"} Sensor:")
+        print(f"{indent}  Temperature: {format_temperature(probe_obj["temperature"], unit)}")
+        print(f"{indent}  Humidity: {format_humidity(probe_obj["humidity"])}")
+        print(f"{indent}  VPD: {format_vpd(probe_obj["vpd"])}")
 
     def _print_json(self, obj: object):
         print(json.dumps(obj, indent=4))
+
+    def _print_ndjson(self, obj: object):
+        print(json.dumps(obj), flush=True)
@@ -1,22 +1,29 @@
 import asyncio
 import struct
-from typing import Literal
+from typing import Any, AsyncIterator, Literal
 
-from bleak import BleakClient
+from bleak import BleakClient, BleakScanner
 from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from bleak.exc import BleakDeviceNotFoundError, BleakError
 
 from vivosun_thermo.conversion import calculate_vpd, celsius_to_fahrenheit
+from vivosun_thermo.registry import DeviceRegistry
 
 CHAR_COMMAND = "0000fff5-0000-1000-8000-00805f9b34fb"
 CHAR_STATUS = "0000fff3-0000-1000-8000-00805f9b34fb"
 
 COMMAND_0D = bytearray([0x0D])
+COMMAND_1100 = bytearray([0x11, 0x00])
+COMMAND_1101 = bytearray([0x11, 0x01])
 
 OFFSET_0D_INT_TEMP = 1
 OFFSET_0D_INT_HUMIDITY = 3
 OFFSET_0D_EXT_TEMP = 7
 OFFSET_0D_EXT_HUMIDITY = 9
 
+HISTORY_RECORD_SIZE = 20
+
 VALUE_NONE = -1  # 0xFF
 
 PROBE_MAIN = "main"
@@ -37,22 +44,82 @@ class VivosunThermoClient:
         read_timeout: float = 0.5,
         cache_ttl: float = 0.5,
         adapter: str | None = None,
+        registry: DeviceRegistry | None = None,
     ):
-        self._client = BleakClient(address_or_ble_device, timout=connect_timeout, adapter=adapter)
+        self._address = (
+            address_or_ble_device
+            if isinstance(address_or_ble_device, str)
+            else address_or_ble_device.address
+        )
+        self._adapter = adapter
+        # registry is only useful when device has to be found by address
+        self._registry = registry if isinstance(address_or_ble_device, str) else None
+        self._registry_hit = False
+        if self._registry is not None:
+            registered_device = self._registry.ble_device(self._address, adapter)
+            if registered_device is not None:
+                address_or_ble_device = registered_device
+                self._registry_hit = True
+        self._client = BleakClient(address_or_ble_device, timeout=connect_timeout, adapter=adapter)
         self._data_0d = bytearray()
         self._data_0d_ts = 0.0
+        self.connect_timeout = connect_timeout
         self.read_timeout = read_timeout
         self.cache_ttl = cache_ttl
 
     async def __aenter__(self):
-        await self._client.connect()
+        await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self._client.disconnect()
 
     async def connect(self):
+        if self._registry is None:
+            await self._client.connect()
+            return
+
+        start = asyncio.get_event_loop().time()
+        hit = self._registry_hit
+        if hit:
+            try:
+                await self._client.connect()
+            except (BleakError, asyncio.TimeoutError):
+                # registered device is stale, forget it and find it again
+                self._registry.forget(self._address)
+                hit = False
+        if hit:
+            self._registry.touch(self._address)
+        else:
+            await self._connect_scanned()
+        self._registry_hit = hit
+        self._registry.record_connect(hit, asyncio.get_event_loop().time() - start)
+        try:
+            self._registry.save()
+        except OSError:
+            pass  # registry is only a cache, failing to save it must not fail the connection
+
+    async def _connect_scanned(self):
+        assert self._registry is not None
+        rssi = 0
+
+        def is_device(device: BLEDevice, adv: AdvertisementData) -> bool:
+            nonlocal rssi
+            if device.address.upper() != self._address.upper():
+                return False
+            rssi = adv.rssi
+            return True
+
+        # adapter is passed to scanner backend, but is not part of typed scanner args in bleak 0.22
+        scanner_kwargs: dict[str, Any] = {"adapter": self._adapter}
+        device = await BleakScanner.find_device_by_filter(
+            is_device, timeout=self.connect_timeout, **scanner_kwargs
+        )
+        if device is None:
+            raise BleakDeviceNotFoundError(self._address)
+        self._client = BleakClient(device, timeout=self.connect_timeout, adapter=self._adapter)
         await self._client.connect()
+        self._registry.register(device, rssi, adapter=self._adapter)
 
     async def disconnect(self):
         await self._client.disconnect()
@@ -85,6 +152,28 @@ class VivosunThermoClient:
         raw_probe_humidity = struct.unpack_from("<h", data, OFFSET_0D_EXT_HUMIDITY)[0]
         return raw_probe_temp != VALUE_NONE and raw_probe_humidity != VALUE_NONE
 
+    async def read_history(self, probe: ProbeType = PROBE_MAIN) -> bytes:
+        data = bytearray()
+        async for chunk in self.iter_history(probe):
+            data += chunk
+        return bytes(data)
+
+    async def iter_history(
+        self, probe: ProbeType = PROBE_MAIN, chunk_records: int = 65536
+    ) -> AsyncIterator[bytearray]:
+        # yield records as they arrive in chunks of up to chunk_records, 20 bytes each
+        command = COMMAND_1100 if probe == PROBE_MAIN else COMMAND_1101
+        chunk_size = chunk_records * HISTORY_RECORD_SIZE
+        chunk = bytearray()
+        async for packet in self._iter_values(command):
+            if packet.startswith(command) and len(packet) >= HISTORY_RECORD_SIZE:
+                chunk += packet[:HISTORY_RECORD_SIZE]
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = bytearray()
+        if chunk:
+            yield chunk
+
     def _decode_float(self, raw: int):
         return 1 / 16 * raw
 
@@ -102,3 +191,18 @@ class VivosunThermoClient:
         result = await asyncio.wait_for(future, self.read_timeout)
         await self._client.stop_notify(CHAR_STATUS)
         return result
+
+    async def _iter_values(self, command: bytearray) -> AsyncIterator[bytearray]:
+        # device sends multiple replies, read them until there is a pause longer than read timeout
+        queue: asyncio.Queue[bytearray] = asyncio.Queue()
+        await self._client.start_notify(CHAR_STATUS, lambda char, data: queue.put_nowait(data))
+        try:
+            await self._client.write_gatt_char(CHAR_COMMAND, command)
+            while True:
+                try:
+                    packet = await asyncio.wait_for(queue.get(), self.read_timeout)
+                except asyncio.TimeoutError:
+                    return
+                yield packet
+        finally:
+            await self._client.stop_notify(CHAR_STATUS)
@@ -1,11 +1,29 @@
 import math
+from typing import TYPE_CHECKING, Any, Callable
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
-def calculate_vpd(temperature_c: float, humidity: float) -> float:
-    e_s = 0.6108 * math.exp((17.27 * temperature_c) / (temperature_c + 237.3))
+
+def _vpd(temperature_c: Any, humidity: Any, exp: Callable[[Any], Any]) -> Any:
+    e_s = 0.6108 * exp((17.27 * temperature_c) / (temperature_c + 237.3))
     e_a = e_s * (humidity / 100)
     return e_s - e_a
 
 
+def calculate_vpd(temperature_c: float, humidity: float) -> float:
+    return _vpd(temperature_c, humidity, math.exp)
+
+
+def calculate_vpd_array(
+    temperature_c: "npt.NDArray[np.floating]", humidity: "npt.NDArray[np.floating]"
+) -> "npt.NDArray[np.floating]":
+    # numpy is an optional dependency, only needed for array conversions
+    import numpy as np
+
+    return _vpd(temperature_c, humidity, np.exp)
+
+
 def celsius_to_fahrenheit(celsius: float) -> float:
     return (celsius * 9 / 5) + 32
@@ -0,0 +1,161 @@
+import time
+from typing import Iterator, Literal
+
+import numpy as np
+import numpy.typing as npt
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from vivosun_thermo.client import (
+    HISTORY_RECORD_SIZE,
+    PROBE_EXTERNAL,
+    PROBE_MAIN,
+    ProbeType,
+    VivosunThermoClient,
+)
+from vivosun_thermo.conversion import calculate_vpd_array
+
+EXPORT_PARQUET = "parquet"
+EXPORT_ARROW = "arrow"
+
+SOURCE_STATUS = "status"
+SOURCE_HISTORY = "history"
+
+ExportFormat = Literal["parquet", "arrow"]
+
+HISTORY_DTYPE = np.dtype(
+    [
+        ("command_code", "<u2"),
+        ("record", "<u2"),
+        ("temp_c", "<i2"),
+        ("humidity", "<i2"),
+        ("reserved", "V12"),
+    ]
+)
+
+SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ms", tz="UTC")),  # null for history records
+        ("device", pa.string()),
+        ("probe", pa.string()),
+        ("source", pa.string()),
+        ("record", pa.uint16()),  # null for status readings
+        ("temperature", pa.float32()),  # °C
+        ("humidity", pa.float32()),
+        ("vpd", pa.float32()),  # kPa
+    ]
+)
+
+
+def decode_history(data: bytes | bytearray) -> npt.NDArray[np.void]:
+    count = len(data) // HISTORY_RECORD_SIZE
+    return np.frombuffer(data, dtype=HISTORY_DTYPE, count=count)
+
+
+def history_batches(
+    device: str, probe: ProbeType, data: bytes | bytearray, batch_size: int = 65536
+) -> Iterator[pa.RecordBatch]:
+    records = decode_history(data)
+    for offset in range(0, len(records), batch_size):
+        chunk = records[offset : offset + batch_size]
+        size = len(chunk)
+        temp = chunk["temp_c"].astype(np.float32) / 16
+        humidity = chunk["humidity"].astype(np.float32) / 16
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.nulls(size, SCHEMA.field("timestamp").type),
+                pa.repeat(pa.scalar(device, pa.string()), size),
+                pa.repeat(pa.scalar(probe, pa.string()), size),
+                pa.repeat(pa.scalar(SOURCE_HISTORY, pa.string()), size),
+                pa.array(chunk["record"], type=pa.uint16()),
+                pa.array(temp, type=pa.float32()),
+                pa.array(humidity, type=pa.float32()),
+                pa.array(calculate_vpd_array(temp, humidity), type=pa.float32()),
+            ],
+            schema=SCHEMA,
+        )
+
+
+async def status_batch(
+    client: VivosunThermoClient, device: str, probes: list[ProbeType]
+) -> pa.RecordBatch:
+    timestamp = int(time.time() * 1000)
+    size = len(probes)
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([timestamp] * size, type=SCHEMA.field("timestamp").type),
+            pa.array([device] * size, type=pa.string()),
+            pa.array(probes, type=pa.string()),
+            pa.array([SOURCE_STATUS] * size, type=pa.string()),
+            pa.nulls(size, pa.uint16()),
+            pa.array([await client.current_temperature(p) for p in probes], type=pa.float32()),
+            pa.array([await client.current_humidity(p) for p in probes], type=pa.float32()),
+            pa.array([await client.current_vpd(p) for p in probes], type=pa.float32()),
+        ],
+        schema=SCHEMA,
+    )
+
+
+class VivosunThermoExporter:
+    def __init__(
+        self,
+        path: str,
+        format: ExportFormat = EXPORT_PARQUET,
+        compression: str | None = "zstd",
+        row_group_size: int = 65536,
+    ):
+        if row_group_size < 1:
+            raise ValueError("Row group size must be positive")
+        if format == EXPORT_PARQUET:
+            self._writer = pq.ParquetWriter(path, SCHEMA, compression=compression or "none")
+        elif format == EXPORT_ARROW:
+            options = ipc.IpcWriteOptions(compression=compression)
+            self._writer = ipc.new_file(path, SCHEMA, options=options)
+        else:
+            raise ValueError(f"Unknown export format {format}")
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._pending: list[pa.RecordBatch] = []
+        self._pending_rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, batch: pa.RecordBatch):
+        # buffer small batches to avoid tiny row groups, but never hold more than one row group
+        while batch.num_rows > 0:
+            take = min(batch.num_rows, self.row_group_size - self._pending_rows)
+            self._pending.append(batch.slice(0, take))
+            self._pending_rows += take
+            batch = batch.slice(take)
+            if self._pending_rows >= self.row_group_size:
+                self.flush()
+
+    def flush(self):
+        if self._pending_rows == 0:
+            return
+        table = pa.Table.from_batches(self._pending, schema=SCHEMA).combine_chunks()
+        self._writer.write_table(table)
+        self.rows += self._pending_rows
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    async def export_device(self, client: VivosunThermoClient, device: str, history: bool = True):
+        probes: list[ProbeType] = [PROBE_MAIN]
+        if await client.has_external_probe():
+            probes.append(PROBE_EXTERNAL)
+        self.write(await status_batch(client, device, probes))
+        if not history:
+            return
+        for probe in probes:
+            async for data in client.iter_history(probe, self.row_group_size):
+                for batch in history_batches(device, probe, data, self.row_group_size):
+                    self.write(batch)
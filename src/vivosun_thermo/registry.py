@@ -0,0 +1,134 @@
+import contextlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, NamedTuple
+
+from bleak.backends.device import BLEDevice
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+
+class DeviceEntry(NamedTuple):
+    address: str
+    name: str | None
+    adapter: str | None
+    rssi: int
+    last_seen: float
+    details: dict[str, Any] | None  # backend details needed to connect without scan
+
+
+class ConnectStats(NamedTuple):
+    hits: int
+    misses: int
+    hit_time: float  # total connect time for hits
+    miss_time: float  # total scan and connect time for misses
+
+    @property
+    def avg_hit_time(self) -> float:
+        return self.hit_time / self.hits if self.hits else 0.0
+
+    @property
+    def avg_miss_time(self) -> float:
+        return self.miss_time / self.misses if self.misses else 0.0
+
+    @property
+    def saved_time(self) -> float:
+        if not self.hits or not self.misses:
+            return 0.0
+        return max(self.avg_miss_time - self.avg_hit_time, 0.0) * self.hits
+
+
+def default_registry_path() -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "vivosun-thermo", "devices.json")
+
+
+class DeviceRegistry:
+    def __init__(self, path: str | None = None, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path or default_registry_path()
+        self.max_age = max_age
+        self.devices: dict[str, DeviceEntry] = {}
+        self.stats = ConnectStats(0, 0, 0.0, 0.0)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+            self.devices = {
+                entry["address"].upper(): DeviceEntry(**entry) for entry in data["devices"]
+            }
+            self.stats = ConnectStats(**data["stats"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.devices = {}
+            self.stats = ConnectStats(0, 0, 0.0, 0.0)
+
+    def save(self):
+        data = {
+            "devices": [entry._asdict() for entry in self.devices.values()],
+            "stats": self.stats._asdict(),
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # unique temp file, so concurrent processes don't overwrite each other's temp file
+        file = tempfile.NamedTemporaryFile(
+            "w", dir=directory, prefix=".devices-", suffix=".tmp", delete=False
+        )
+        try:
+            with file:
+                json.dump(data, file, indent=4)
+            os.replace(file.name, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(file.name)
+            raise
+
+    def get(self, address: str, adapter: str | None = None) -> DeviceEntry | None:
+        entry = self.devices.get(address.upper())
+        if entry is None or entry.adapter != adapter:
+            return None
+        if time.time() - entry.last_seen > self.max_age:
+            return None
+        return entry
+
+    def ble_device(self, address: str, adapter: str | None = None) -> BLEDevice | None:
+        entry = self.get(address, adapter)
+        if entry is None or entry.details is None:
+            return None
+        return BLEDevice(entry.address, entry.name, entry.details, rssi=entry.rssi)
+
+    def register(self, device: BLEDevice, rssi: int, adapter: str | None = None):
+        self.devices[device.address.upper()] = DeviceEntry(
+            address=device.address,
+            name=device.name,
+            adapter=adapter,
+            rssi=rssi,
+            last_seen=time.time(),
+            details=self._persistable_details(device.details),
+        )
+
+    def touch(self, address: str):
+        entry = self.devices.get(address.upper())
+        if entry is not None:
+            self.devices[address.upper()] = entry._replace(last_seen=time.time())
+
+    def forget(self, address: str):
+        self.devices.pop(address.upper(), None)
+
+    def record_connect(self, hit: bool, elapsed: float):
+        if hit:
+            self.stats = self.stats._replace(
+                hits=self.stats.hits + 1, hit_time=self.stats.hit_time + elapsed
+            )
+        else:
+            self.stats = self.stats._replace(
+                misses=self.stats.misses + 1, miss_time=self.stats.miss_time + elapsed
+            )
+
+    def _persistable_details(self, details: Any) -> dict[str, Any] | None:
+        # only BlueZ device path survives restarts, CoreBluetooth and WinRT objects can't be saved
+        if isinstance(details, dict) and isinstance(details.get("path"), str):
+            return {"path": details["path"]}
+        return None
@@ -0,0 +1,109 @@
+import math
+from typing import Literal, NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+METHOD_LINEAR = "linear"
+METHOD_PREVIOUS = "previous"
+METHOD_NEAREST = "nearest"
+
+ResampleMethod = Literal["linear", "previous", "nearest"]
+
+
+class TimeSeries(NamedTuple):
+    name: str
+    timestamps: npt.NDArray[np.float64]  # seconds since epoch
+    values: npt.NDArray[np.float64]
+
+
+class AlignedSeries(NamedTuple):
+    names: list[str]
+    timestamps: npt.NDArray[np.float64]  # shape (n_points,)
+    values: npt.NDArray[np.float64]  # shape (n_points, n_series), NaN where no data
+
+
+def make_series(name: str, timestamps: npt.ArrayLike, values: npt.ArrayLike) -> TimeSeries:
+    ts = np.asarray(timestamps, dtype=np.float64)
+    vs = np.asarray(values, dtype=np.float64)
+    if ts.ndim != 1 or ts.shape != vs.shape:
+        raise ValueError(f"Timestamps and values of {name} must be 1-D arrays of the same length")
+    valid = ~(np.isnan(ts) | np.isnan(vs))
+    ts, vs = ts[valid], vs[valid]
+    if ts.size > 1 and np.any(np.diff(ts) < 0):
+        order = np.argsort(ts, kind="stable")
+        ts, vs = ts[order], vs[order]
+    return TimeSeries(name, ts, vs)
+
+
+def make_grid(
+    series: Sequence[TimeSeries],
+    step: float,
+    start: float | None = None,
+    end: float | None = None,
+) -> npt.NDArray[np.float64]:
+    if step <= 0:
+        raise ValueError("Step must be positive")
+    non_empty = [s for s in series if s.timestamps.size > 0]
+    if start is None:
+        if not non_empty:
+            raise ValueError("Start is required when all series are empty")
+        start = math.floor(min(float(s.timestamps[0]) for s in non_empty) / step) * step
+    if end is None:
+        if not non_empty:
+            raise ValueError("End is required when all series are empty")
+        end = max(float(s.timestamps[-1]) for s in non_empty)
+    count = math.floor((end - start) / step) + 1
+    return start + step * np.arange(max(count, 0), dtype=np.float64)
+
+
+def resample(
+    series: TimeSeries,
+    grid: npt.NDArray[np.float64],
+    method: ResampleMethod = METHOD_LINEAR,
+    max_gap: float | None = None,
+) -> npt.NDArray[np.float64]:
+    ts, vs = series.timestamps, series.values
+    result = np.full(grid.shape, np.nan, dtype=np.float64)
+    if ts.size == 0:
+        return result
+
+    # last sample at or before and first sample at or after every grid point
+    left = np.searchsorted(ts, grid, side="right") - 1
+    right = np.searchsorted(ts, grid, side="left")
+    inside = (left >= 0) & (right < ts.size)
+    if max_gap is not None:
+        gap = ts[np.minimum(right, ts.size - 1)] - ts[np.maximum(left, 0)]
+        inside &= gap <= max_gap
+
+    left, right, points = left[inside], right[inside], grid[inside]
+
+    if method == METHOD_LINEAR:
+        t0, t1 = ts[left], ts[right]
+        span = t1 - t0
+        weight = np.divide(points - t0, span, out=np.zeros_like(span), where=span > 0)
+        result[inside] = vs[left] + (vs[right] - vs[left]) * weight
+    elif method == METHOD_PREVIOUS:
+        result[inside] = vs[left]
+    elif method == METHOD_NEAREST:
+        use_right = (ts[right] - points) < (points - ts[left])
+        result[inside] = vs[np.where(use_right, right, left)]
+    else:
+        raise ValueError(f"Unknown resample method {method}")
+
+    return result
+
+
+def align(
+    series: Sequence[TimeSeries],
+    step: float,
+    method: ResampleMethod = METHOD_LINEAR,
+    max_gap: float | None = None,
+    start: float | None = None,
+    end: float | None = None,
+) -> AlignedSeries:
+    grid = make_grid(series, step, start, end)
+    values = np.full((grid.size, len(series)), np.nan, dtype=np.float64)
+    for column, item in enumerate(series):
+        values[:, column] = resample(item, grid, method, max_gap)
+    return AlignedSeries([s.name for s in series], grid, values)
@@ -1,11 +1,26 @@
 from bleak import BleakScanner
 from bleak.backends.device import BLEDevice
 
+from vivosun_thermo.registry import DeviceRegistry
+
 NAME_VS_THB1S = "ThermoBeacon2"
 
 
 class VivosunThermoScanner:
     @classmethod
-    async def discover(cls, timeout: float = 30, adapter: str | None = None) -> list[BLEDevice]:
-        devices = await BleakScanner.discover(timeout=timeout, adapter=adapter)
-        return [dev for dev in devices if dev.name == NAME_VS_THB1S]
+    async def discover(
+        cls,
+        timeout: float = 30,
+        adapter: str | None = None,
+        registry: DeviceRegistry | None = None,
+    ) -> list[BLEDevice]:
+        devices = await BleakScanner.discover(timeout=timeout, adapter=adapter, return_adv=True)
+        result = [(dev, adv) for dev, adv in devices.values() if dev.name == NAME_VS_THB1S]
+        if registry is not None:
+            for dev, adv in result:
+                registry.register(dev, adv.rssi, adapter=adapter)
+            try:
+                registry.save()
+            except OSError:
+                pass  # registry is only a cache, failing to save it must not fail the scan
+        return [dev for dev, _ in result]
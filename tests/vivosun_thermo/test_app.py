@@ -0,0 +1,180 @@
+import asyncio
+import json
+from unittest import mock
+
+import pyarrow.parquet as pq
+import pytest
+
+from vivosun_thermo.app import VivosunThermoApp
+from vivosun_thermo.client import PROBE_MAIN
+
+
+class FakeClient:
+    active = 0
+    max_active = 0
+    delays = {"slow": 0.2, "fast": 0.0, "other": 0.1}
+
+    def __init__(self, address: str, **kwargs):
+        self.address = address
+
+    async def __aenter__(self):
+        if self.address == "broken":
+            raise ConnectionError("device not found")
+        FakeClient.active += 1
+        FakeClient.max_active = max(FakeClient.max_active, FakeClient.active)
+        await asyncio.sleep(self.delays.get(self.address, 0))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        FakeClient.active -= 1
+
+    async def has_external_probe(self):
+        return False
+
+    async def current_temperature(self, probe=PROBE_MAIN, unit="c"):
+        return 20.5
+
+    async def current_humidity(self, probe=PROBE_MAIN):
+        return 44.0
+
+    async def current_vpd(self, probe=PROBE_MAIN):
+        return 1.36
+
+    async def iter_history(self, probe=PROBE_MAIN, chunk_records=65536):
+        yield bytearray.fromhex("11 00 BC 05 5C 01 94 02  00 03 00 05 00 03 01 00  00 00 00 00")
+
+
+class TestVivosunThermoApp:
+    @pytest.fixture(autouse=True)
+    def fake_client(self):
+        FakeClient.active = 0
+        FakeClient.max_active = 0
+        with mock.patch("vivosun_thermo.app.VivosunThermoClient", FakeClient):
+            yield FakeClient
+
+    async def run(self, *args: str) -> int:
+        return await VivosunThermoApp().run(["vivosun-thermo", "--no-registry", *args])
+
+    @pytest.mark.asyncio
+    async def test_status_single_json(self, capsys):
+        assert await self.run("-f", "json", "status", "fast") == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result == {"main_sensor": {"temperature": 20.5, "humidity": 44.0, "vpd": 1.36}}
+
+    @pytest.mark.asyncio
+    async def test_status_batch_json(self, capsys):
+        assert await self.run("-f", "json", "status", "slow", "broken", "fast") == 1
+        result = json.loads(capsys.readouterr().out)
+        assert list(result) == ["slow", "broken", "fast"]
+        assert result["slow"]["main_sensor"]["temperature"] == 20.5
+        assert result["broken"] == {"error": "ConnectionError: device not found"}
+
+    @pytest.mark.asyncio
+    async def test_status_batch_ndjson(self, capsys):
+        assert await self.run("-f", "ndjson", "status", "slow", "other", "fast") == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["address"] for line in lines] == ["fast", "other", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_status_batch_concurrency(self, fake_client):
+        assert await self.run("-f", "json", "status", "--concurrency", "2", "slow", "other") == 0
+        assert fake_client.max_active == 2
+        fake_client.max_active = 0
+        assert await self.run("-f", "json", "status", "--concurrency", "1", "slow", "other") == 0
+        assert fake_client.max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_status_batch_timeout(self, capsys):
+        assert (
+            await self.run("-f", "json", "status", "--device-timeout", "0.1", "slow", "fast") == 1
+        )
+        result = json.loads(capsys.readouterr().out)
+        assert result["slow"] == {"error": "TimeoutError"}
+        assert "main_sensor" in result["fast"]
+
+    @pytest.mark.asyncio
+    async def test_status_inventory(self, capsys, tmp_path):
+        inventory = tmp_path / "inventory.txt"
+        inventory.write_text("# room 1\nfast\n\nother  # tent\nfast\n")
+        assert await self.run("-f", "json", "status", "--inventory", str(inventory)) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert list(result) == ["fast", "other"]
+
+    @pytest.mark.asyncio
+    async def test_status_batch_text(self, capsys):
+        assert await self.run("status", "fast", "broken") == 1
+        out = capsys.readouterr().out
+        assert "Device fast:\n  Main Sensor:\n    Temperature: 20.5°C" in out
+        assert "Device broken:\n  Error: ConnectionError: device not found" in out
+
+    @pytest.mark.asyncio
+    async def test_status_single_timeout(self):
+        with pytest.raises(asyncio.TimeoutError):
+            await self.run("-f", "json", "status", "--device-timeout", "0.1", "slow")
+
+    @pytest.mark.asyncio
+    async def test_status_single_inventory(self, capsys, tmp_path):
+        inventory = tmp_path / "inventory.txt"
+        inventory.write_text("fast\n")
+        assert await self.run("-f", "json", "status", "--inventory", str(inventory)) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert list(result) == ["fast"]
+
+    @pytest.mark.asyncio
+    async def test_status_duplicate_addresses(self, capsys):
+        assert await self.run("-f", "json", "status", "fast", "fast") == 0
+        result = json.loads(capsys.readouterr().out)
+        assert list(result) == ["fast"]
+
+    @pytest.mark.asyncio
+    async def test_status_inventory_missing(self, capsys, tmp_path):
+        with pytest.raises(SystemExit):
+            await self.run("status", "--inventory", str(tmp_path / "missing.txt"))
+        assert "can't read inventory file" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("concurrency", ["0", "-1", "x"])
+    async def test_status_invalid_concurrency(self, capsys, concurrency):
+        with pytest.raises(SystemExit):
+            await self.run("status", "--concurrency", concurrency, "fast", "slow")
+        assert "--concurrency" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_timeout", ["0", "-1", "x"])
+    async def test_status_invalid_device_timeout(self, capsys, device_timeout):
+        with pytest.raises(SystemExit):
+            await self.run("status", "--device-timeout", device_timeout, "fast", "slow")
+        assert "--device-timeout" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    async def test_status_default_device_timeout(self):
+        app = VivosunThermoApp()
+        with mock.patch.object(app, "cmd_status", mock.AsyncMock()) as cmd_status:
+            await app.run(["vivosun-thermo", "status", "--connect-timeout", "10", "fast"])
+            await app.run(["vivosun-thermo", "status", "--device-timeout", "5", "fast"])
+        calls = cmd_status.await_args_list
+        assert calls[0].args[0].device_timeout == 35
+        assert calls[1].args[0].device_timeout == 5
+
+    @pytest.mark.asyncio
+    async def test_export_skips_failed_device(self, capsys, tmp_path):
+        path = str(tmp_path / "export.parquet")
+        assert await self.run("-f", "json", "export", "-o", path, "fast", "broken", "other") == 1
+        result = json.loads(capsys.readouterr().out)
+        assert result["rows"] == 4
+        assert result["errors"] == {"broken": "ConnectionError: device not found"}
+        table = pq.read_table(path)
+        assert set(table.column("device").to_pylist()) == {"fast", "other"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("row_group_size", ["0", "-1"])
+    async def test_export_invalid_row_group_size(self, capsys, tmp_path, row_group_size):
+        path = str(tmp_path / "export.parquet")
+        with pytest.raises(SystemExit):
+            await self.run("export", "-o", path, "--row-group-size", row_group_size, "fast")
+        assert "--row-group-size" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    async def test_status_no_addresses(self):
+        with pytest.raises(SystemExit):
+            await self.run("status")
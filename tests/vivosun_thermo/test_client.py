@@ -1,25 +1,34 @@
 import asyncio
+import time
 from typing import Any
 from unittest import mock
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from bleak import BleakClient
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakDeviceNotFoundError, BleakError
 
 from vivosun_thermo.client import (
     CHAR_STATUS,
     COMMAND_0D,
+    COMMAND_1100,
     PROBE_EXTERNAL,
     PROBE_MAIN,
     UNIT_CELSIUS,
     UNIT_FAHRENHEIT,
     VivosunThermoClient,
 )
+from vivosun_thermo.registry import DeviceRegistry
 
 
 class TestVivosunThermoClient:
     msg_0d_int = bytearray.fromhex("0D 4B 01 C3 02 88 00 FF  FF FF FF FF FF 00 00 00  00 00 00 00")
     msg_0d_both = bytearray.fromhex("0D 56 01 7D 02 99 00 5A  01 6E 02 9E 00 00 00 00  00 00 00 00")
+    msg_1100 = [
+        bytearray.fromhex("11 00 BC 05 5C 01 94 02  00 03 00 05 00 03 01 00  00 00 00 00"),
+        bytearray.fromhex("11 00 C3 05 5D 01 9F 02  00 FF 00 02 00 01 00 00  00 00 01 00"),
+    ]
 
     @pytest.fixture
     def bleak_client(self):
@@ -45,6 +54,9 @@ class TestVivosunThermoClient:
             if notify_callback is not None:
                 if data.startswith(COMMAND_0D):
                     loop.call_soon(lambda buf: notify_callback(char, buf), self.msg_0d_int)
+                elif data.startswith(COMMAND_1100):
+                    for msg in self.msg_1100:
+                        loop.call_soon(lambda buf: notify_callback(char, buf), msg)
                 else:
                     raise ValueError(f"Unknown command {data}")
             else:
@@ -64,6 +76,32 @@ class TestVivosunThermoClient:
     def client(self, bleak_client):
         return VivosunThermoClient("mock_address")
 
+    @pytest.fixture
+    def ble_device(self):
+        return BLEDevice(
+            "mock_address", "ThermoBeacon2", {"path": "/org/bluez/hci0/dev_mock"}, rssi=-60
+        )
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        return DeviceRegistry(str(tmp_path / "devices.json"))
+
+    @pytest.fixture
+    def bleak_scanner(self, ble_device):
+        other_device = BLEDevice("other_address", "ThermoBeacon2", {}, rssi=-40)
+
+        async def find_device_by_filter_side_effect(filterfunc: Any, **kwargs: Any):
+            for device, rssi in ((other_device, -40), (ble_device, -70)):
+                if filterfunc(device, MagicMock(rssi=rssi)):
+                    return device
+            return None
+
+        with mock.patch("vivosun_thermo.client.BleakScanner") as MockBleakScanner:
+            MockBleakScanner.find_device_by_filter = AsyncMock(
+                side_effect=find_device_by_filter_side_effect
+            )
+            yield MockBleakScanner
+
     @pytest.mark.asyncio
     async def test_connect(self, client, bleak_client):
         await client.connect()
@@ -74,6 +112,58 @@ class TestVivosunThermoClient:
         await client.disconnect()
         bleak_client.disconnect.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_connect_registry_hit(self, bleak_client, bleak_scanner, registry, ble_device):
+        registry.register(ble_device, -60)
+        registry.devices["MOCK_ADDRESS"] = registry.devices["MOCK_ADDRESS"]._replace(
+            last_seen=time.time() - 3600
+        )
+        client = VivosunThermoClient("mock_address", registry=registry)
+        await client.connect()
+        bleak_client.connect.assert_awaited_once()
+        bleak_scanner.find_device_by_filter.assert_not_awaited()
+        assert registry.stats.hits == 1
+        assert registry.stats.misses == 0
+        assert DeviceRegistry(registry.path).devices["MOCK_ADDRESS"].last_seen > time.time() - 60
+
+    @pytest.mark.asyncio
+    async def test_connect_registry_miss(self, bleak_client, bleak_scanner, registry):
+        client = VivosunThermoClient("mock_address", registry=registry)
+        await client.connect()
+        bleak_scanner.find_device_by_filter.assert_awaited_once()
+        bleak_client.connect.assert_awaited_once()
+        assert registry.stats.misses == 1
+        assert registry.ble_device("mock_address") is not None
+        assert registry.devices["MOCK_ADDRESS"].rssi == -70
+        assert DeviceRegistry(registry.path).stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_registry_save_failed(self, bleak_client, bleak_scanner, tmp_path):
+        (tmp_path / "file").write_text("")
+        registry = DeviceRegistry(str(tmp_path / "file" / "devices.json"))
+        async with VivosunThermoClient("mock_address", registry=registry):
+            bleak_client.connect.assert_awaited_once()
+        bleak_client.disconnect.assert_awaited_once()
+        assert registry.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_registry_stale(self, bleak_client, bleak_scanner, registry, ble_device):
+        registry.register(ble_device, -60)
+        bleak_client.connect.side_effect = [BleakError("stale"), None]
+        client = VivosunThermoClient("mock_address", registry=registry)
+        await client.connect()
+        bleak_scanner.find_device_by_filter.assert_awaited_once()
+        assert bleak_client.connect.await_count == 2
+        assert registry.stats.hits == 0
+        assert registry.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_registry_not_found(self, bleak_client, bleak_scanner, registry):
+        client = VivosunThermoClient("unknown_address", registry=registry)
+        with pytest.raises(BleakDeviceNotFoundError):
+            await client.connect()
+        bleak_client.connect.assert_not_awaited()
+
     @pytest.mark.asyncio
     def test_is_connected_true(self, client, bleak_client):
         bleak_client.is_connected = True
@@ -138,3 +228,16 @@ class TestVivosunThermoClient:
     async def test_has_external_probe_false(self, client):
         value = await client.has_external_probe()
         assert value is False
+
+    @pytest.mark.asyncio
+    async def test_read_history(self, client, bleak_client):
+        client.read_timeout = 0.05
+        value = await client.read_history(probe=PROBE_MAIN)
+        assert value == b"".join(self.msg_1100)
+        bleak_client.stop_notify.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_iter_history_chunks(self, client):
+        client.read_timeout = 0.05
+        chunks = [chunk async for chunk in client.iter_history(PROBE_MAIN, chunk_records=1)]
+        assert chunks == self.msg_1100
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from vivosun_thermo.conversion import calculate_vpd, calculate_vpd_array, celsius_to_fahrenheit
+
+
+class TestConversion:
+    def test_calculate_vpd(self):
+        assert round(calculate_vpd(20.6875, 44.1875), 2) == 1.36
+
+    def test_calculate_vpd_array(self):
+        temp = np.array([20.6875, 21.75, 30.0])
+        humidity = np.array([44.1875, 41.25, 80.0])
+        result = calculate_vpd_array(temp, humidity)
+        expected = [calculate_vpd(t, h) for t, h in zip(temp.tolist(), humidity.tolist())]
+        assert result.tolist() == pytest.approx(expected)
+
+    def test_celsius_to_fahrenheit(self):
+        assert celsius_to_fahrenheit(20) == 68
@@ -0,0 +1,109 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pytest
+
+from vivosun_thermo.client import (
+    HISTORY_RECORD_SIZE,
+    PROBE_EXTERNAL,
+    PROBE_MAIN,
+    VivosunThermoClient,
+)
+from vivosun_thermo.export import (
+    EXPORT_ARROW,
+    EXPORT_PARQUET,
+    SCHEMA,
+    SOURCE_HISTORY,
+    SOURCE_STATUS,
+    VivosunThermoExporter,
+    decode_history,
+    history_batches,
+)
+
+
+class TestExport:
+    data_1100 = bytes.fromhex(
+        "11 00 BC 05 5C 01 94 02  00 03 00 05 00 03 01 00  00 00 00 00"
+        "11 00 C3 05 5D 01 9F 02  00 FF 00 02 00 01 00 00  00 00 01 00"
+        "11 00 CA 05 5D 01 A1 02  00 01 00 01 00 00 00 02  00 00 00 01"
+    )
+
+    @pytest.fixture
+    def client(self):
+        client = MagicMock(VivosunThermoClient)
+        client.has_external_probe = AsyncMock(return_value=True)
+        client.current_temperature = AsyncMock(return_value=20.5)
+        client.current_humidity = AsyncMock(return_value=44.0)
+        client.current_vpd = AsyncMock(return_value=1.36)
+        client.iter_history = MagicMock(side_effect=self.iter_history)
+        return client
+
+    async def iter_history(self, probe, chunk_records):
+        chunk_size = chunk_records * HISTORY_RECORD_SIZE
+        for offset in range(0, len(self.data_1100), chunk_size):
+            yield bytearray(self.data_1100[offset : offset + chunk_size])
+
+    def test_decode_history(self):
+        records = decode_history(self.data_1100)
+        assert records["record"].tolist() == [0x05BC, 0x05C3, 0x05CA]
+        assert records["temp_c"].tolist() == [0x015C, 0x015D, 0x015D]
+        assert records["humidity"].tolist() == [0x0294, 0x029F, 0x02A1]
+
+    def test_history_batches(self):
+        batches = list(history_batches("dev", PROBE_MAIN, self.data_1100, batch_size=2))
+        assert [batch.num_rows for batch in batches] == [2, 1]
+        batch = batches[0]
+        assert batch.schema == SCHEMA
+        assert batch.column("device").to_pylist() == ["dev", "dev"]
+        assert batch.column("source").to_pylist() == [SOURCE_HISTORY, SOURCE_HISTORY]
+        assert batch.column("timestamp").null_count == 2
+        assert batch.column("temperature").to_pylist() == [21.75, 21.8125]
+        assert [round(v, 2) for v in batch.column("vpd").to_pylist()] == [1.53, 1.52]
+
+    @pytest.mark.asyncio
+    async def test_export_parquet(self, client, tmp_path):
+        path = str(tmp_path / "export.parquet")
+        with VivosunThermoExporter(path, EXPORT_PARQUET, row_group_size=4) as exporter:
+            await exporter.export_device(client, "dev")
+        assert exporter.rows == 8
+        file = pq.ParquetFile(path)
+        assert file.metadata.num_row_groups == 2
+        table = file.read()
+        assert table.schema == SCHEMA
+        assert table.column("source").to_pylist() == [SOURCE_STATUS] * 2 + [SOURCE_HISTORY] * 6
+        assert table.column("probe").to_pylist() == (
+            [PROBE_MAIN, PROBE_EXTERNAL] + [PROBE_MAIN] * 3 + [PROBE_EXTERNAL] * 3
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_arrow_without_history(self, client, tmp_path):
+        path = str(tmp_path / "export.arrow")
+        with VivosunThermoExporter(path, EXPORT_ARROW, compression=None) as exporter:
+            await exporter.export_device(client, "dev", history=False)
+        table = ipc.open_file(path).read_all()
+        assert table.num_rows == 2
+        assert table.column("temperature").to_pylist() == [20.5, 20.5]
+        client.iter_history.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_export_probes_checked_once(self, client, tmp_path):
+        client.has_external_probe.side_effect = [False, True]
+        path = str(tmp_path / "export.parquet")
+        with VivosunThermoExporter(path, EXPORT_PARQUET) as exporter:
+            await exporter.export_device(client, "dev")
+        client.has_external_probe.assert_awaited_once()
+        table = pq.read_table(path)
+        assert set(table.column("probe").to_pylist()) == {PROBE_MAIN}
+        assert exporter.rows == 4
+
+    @pytest.mark.parametrize("row_group_size", [0, -1])
+    def test_invalid_row_group_size(self, tmp_path, row_group_size):
+        path = tmp_path / "export.parquet"
+        with pytest.raises(ValueError):
+            VivosunThermoExporter(str(path), EXPORT_PARQUET, row_group_size=row_group_size)
+        assert not path.exists()
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            VivosunThermoExporter(str(tmp_path / "export.csv"), "csv")  # type: ignore
@@ -0,0 +1,103 @@
+import json
+import os
+import time
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+from vivosun_thermo.registry import ConnectStats, DeviceRegistry
+
+
+class TestDeviceRegistry:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "registry" / "devices.json")
+
+    @pytest.fixture
+    def registry(self, path):
+        return DeviceRegistry(path)
+
+    @pytest.fixture
+    def bluez_device(self):
+        details = {"path": "/org/bluez/hci0/dev_AA_BB", "props": {"RSSI": -60}}
+        return BLEDevice("AA:BB", "ThermoBeacon2", details, rssi=-60)
+
+    def test_empty(self, registry):
+        assert registry.devices == {}
+        assert registry.stats == ConnectStats(0, 0, 0.0, 0.0)
+        assert registry.get("AA:BB") is None
+
+    def test_register_and_get(self, registry, bluez_device):
+        registry.register(bluez_device, -60, adapter="hci0")
+        entry = registry.get("aa:bb", adapter="hci0")
+        assert entry is not None
+        assert entry.rssi == -60
+        assert entry.details == {"path": "/org/bluez/hci0/dev_AA_BB"}
+        assert registry.get("AA:BB", adapter="hci1") is None
+
+    def test_touch(self, registry, bluez_device):
+        registry.register(bluez_device, -60)
+        registry.devices["AA:BB"] = registry.devices["AA:BB"]._replace(last_seen=0.0)
+        registry.touch("aa:bb")
+        entry = registry.devices["AA:BB"]
+        assert entry.last_seen > time.time() - 60
+        assert entry.rssi == -60
+
+    def test_ble_device(self, registry, bluez_device):
+        registry.register(bluez_device, -60)
+        device = registry.ble_device("AA:BB")
+        assert device is not None
+        assert device.address == "AA:BB"
+        assert device.details == {"path": "/org/bluez/hci0/dev_AA_BB"}
+
+    def test_ble_device_without_details(self, registry):
+        registry.register(BLEDevice("AA:BB", "ThermoBeacon2", object(), rssi=-60), -60)
+        assert registry.get("AA:BB") is not None
+        assert registry.ble_device("AA:BB") is None
+
+    def test_stale_entry(self, path, bluez_device):
+        registry = DeviceRegistry(path, max_age=60)
+        registry.register(bluez_device, -60)
+        registry.devices["AA:BB"] = registry.devices["AA:BB"]._replace(last_seen=time.time() - 120)
+        assert registry.get("AA:BB") is None
+        assert registry.ble_device("AA:BB") is None
+
+    def test_forget(self, registry, bluez_device):
+        registry.register(bluez_device, -60)
+        registry.forget("aa:bb")
+        assert registry.get("AA:BB") is None
+
+    def test_save_and_load(self, path, registry, bluez_device):
+        registry.register(bluez_device, -60)
+        registry.record_connect(True, 1.0)
+        registry.record_connect(False, 5.0)
+        registry.save()
+        loaded = DeviceRegistry(path)
+        assert loaded.devices == registry.devices
+        assert loaded.stats == ConnectStats(1, 1, 1.0, 5.0)
+        assert loaded.stats.saved_time == 4.0
+
+    def test_save_no_temp_files(self, tmp_path, path, registry, bluez_device):
+        registry.register(bluez_device, -60)
+        registry.save()
+        registry.save()
+        assert os.listdir(tmp_path / "registry") == ["devices.json"]
+
+    def test_save_failed(self, tmp_path, bluez_device):
+        (tmp_path / "file").write_text("")
+        registry = DeviceRegistry(str(tmp_path / "file" / "devices.json"))
+        registry.register(bluez_device, -60)
+        with pytest.raises(OSError):
+            registry.save()
+
+    def test_load_corrupted(self, path, registry):
+        registry.save()
+        with open(path, "w") as file:
+            file.write("{")
+        assert DeviceRegistry(path).devices == {}
+
+    def test_load_invalid(self, path, registry):
+        registry.save()
+        with open(path, "w") as file:
+            json.dump({"devices": [{"address": "AA:BB"}], "stats": {}}, file)
+        assert DeviceRegistry(path).devices == {}
@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+import pytest
+
+from vivosun_thermo.resample import (
+    METHOD_LINEAR,
+    METHOD_NEAREST,
+    METHOD_PREVIOUS,
+    align,
+    make_grid,
+    make_series,
+    resample,
+)
+
+
+class TestResample:
+    @pytest.fixture
+    def series(self):
+        return make_series("main", [0, 10, 20, 60], [1.0, 2.0, 4.0, 8.0])
+
+    def test_make_series_sorts_and_drops_nan(self):
+        series = make_series("main", [20, 0, 10, 30], [3.0, 1.0, 2.0, float("nan")])
+        assert series.timestamps.tolist() == [0, 10, 20]
+        assert series.values.tolist() == [1.0, 2.0, 3.0]
+
+    def test_make_series_shape_mismatch(self):
+        with pytest.raises(ValueError):
+            make_series("main", [0, 1], [1.0])
+
+    def test_make_grid(self, series):
+        other = make_series("external", [7, 75], [0.0, 0.0])
+        grid = make_grid([series, other], step=15)
+        assert grid.tolist() == [0, 15, 30, 45, 60, 75]
+
+    def test_make_grid_explicit_range(self, series):
+        grid = make_grid([series], step=5, start=10, end=20)
+        assert grid.tolist() == [10, 15, 20]
+
+    def test_resample_linear(self, series):
+        grid = np.array([-5.0, 0.0, 5.0, 20.0, 40.0, 60.0, 65.0])
+        values = resample(series, grid, METHOD_LINEAR)
+        assert np.allclose(values, [math.nan, 1.0, 1.5, 4.0, 6.0, 8.0, math.nan], equal_nan=True)
+
+    def test_resample_previous(self, series):
+        grid = np.array([0.0, 5.0, 19.0, 59.0])
+        values = resample(series, grid, METHOD_PREVIOUS)
+        assert values.tolist() == [1.0, 1.0, 2.0, 4.0]
+
+    def test_resample_nearest(self, series):
+        grid = np.array([4.0, 6.0, 35.0, 45.0])
+        values = resample(series, grid, METHOD_NEAREST)
+        assert values.tolist() == [1.0, 2.0, 4.0, 8.0]
+
+    def test_resample_max_gap(self, series):
+        grid = np.array([5.0, 20.0, 40.0])
+        values = resample(series, grid, METHOD_LINEAR, max_gap=15)
+        assert np.allclose(values, [1.5, 4.0, math.nan], equal_nan=True)
+
+    def test_resample_unknown_method(self, series):
+        with pytest.raises(ValueError):
+            resample(series, np.array([5.0]), "cubic")  # type: ignore
+
+    def test_align(self, series):
+        other = make_series("external", [5, 25], [10.0, 30.0])
+        aligned = align([series, other], step=10)
+        assert aligned.names == ["main", "external"]
+        assert aligned.timestamps.tolist() == [0, 10, 20, 30, 40, 50, 60]
+        assert aligned.values.shape == (7, 2)
+        assert np.allclose(aligned.values[:, 0], [1, 2, 4, 5, 6, 7, 8])
+        assert np.allclose(
+            aligned.values[:, 1],
+            [math.nan, 15, 25, math.nan, math.nan, math.nan, math.nan],
+            equal_nan=True,
+        )
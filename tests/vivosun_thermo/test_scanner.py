@@ -0,0 +1,53 @@
+from unittest import mock
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+from vivosun_thermo.registry import DeviceRegistry
+from vivosun_thermo.scanner import NAME_VS_THB1S, VivosunThermoScanner
+
+
+class TestVivosunThermoScanner:
+    @pytest.fixture
+    def devices(self):
+        thermo = BLEDevice("AA:BB", NAME_VS_THB1S, {"path": "/org/bluez/hci0/dev_AA_BB"}, rssi=-60)
+        other = BLEDevice("CC:DD", "Speaker", {"path": "/org/bluez/hci0/dev_CC_DD"}, rssi=-50)
+        return {
+            thermo.address: (thermo, MagicMock(rssi=-61)),
+            other.address: (other, MagicMock(rssi=-51)),
+        }
+
+    @pytest.fixture
+    def bleak_scanner(self, devices):
+        with mock.patch("vivosun_thermo.scanner.BleakScanner") as MockBleakScanner:
+            MockBleakScanner.discover = AsyncMock(return_value=devices)
+            yield MockBleakScanner
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        return DeviceRegistry(str(tmp_path / "devices.json"))
+
+    @pytest.mark.asyncio
+    async def test_discover(self, bleak_scanner):
+        result = await VivosunThermoScanner.discover(timeout=5, adapter="hci0")
+        assert [dev.address for dev in result] == ["AA:BB"]
+        bleak_scanner.discover.assert_awaited_once_with(timeout=5, adapter="hci0", return_adv=True)
+
+    @pytest.mark.asyncio
+    async def test_discover_registry(self, bleak_scanner, registry):
+        await VivosunThermoScanner.discover(adapter="hci0", registry=registry)
+        assert list(registry.devices) == ["AA:BB"]
+        entry = registry.devices["AA:BB"]
+        assert entry.rssi == -61
+        assert entry.adapter == "hci0"
+        assert entry.details == {"path": "/org/bluez/hci0/dev_AA_BB"}
+        assert DeviceRegistry(registry.path).devices == registry.devices
+
+    @pytest.mark.asyncio
+    async def test_discover_registry_save_failed(self, bleak_scanner, tmp_path):
+        (tmp_path / "file").write_text("")
+        registry = DeviceRegistry(str(tmp_path / "file" / "devices.json"))
+        result = await VivosunThermoScanner.discover(registry=registry)
+        assert [dev.address for dev in result] == ["AA:BB"]
+        assert list(registry.devices) == ["AA:BB"]